@@ -38,6 +38,7 @@ LOG_CONFIG = {
             "filename": log_file_path,
             "maxBytes": MAX_LOG_SIZE,
             "backupCount": BACKUP_COUNT,
+            "delay": True, # open on first record, so parser workers that drop this handler never create a file
             "level": "DEBUG",
         },
     },
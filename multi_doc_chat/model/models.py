@@ -12,7 +12,7 @@ class PromptType(str, Enum):
     CONTEXT_QUESTION = "context_question"
 
 class UploadResponse(BaseModel):
-    session_id = str
+    session_id: str
     indexed: bool
     message: str | None = None
 
@@ -1,20 +1,71 @@
+from __future__ import annotations
 import sys
 import os
+import hashlib
+from collections import OrderedDict
+import threading
 from operator import itemgetter
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
 
+from langchain_core.documents import Document
 from langchain_core.messages import BaseMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_community.vectorstores import FAISS
-
-from multi_doc_chat.utils.model_loader import ModelLoader
+from multi_doc_chat.utils.model_loader import get_embeddings, get_llm
+from multi_doc_chat.utils.vector_index import set_search_params
 from multi_doc_chat.logger import logging as log
 from multi_doc_chat.exception import ProjectException
-from multi_doc_chat.prompts.prompt_library import PREOMPT_REGISTRY
-from multi_doc_chat.model.models import PromptType, ChatAnswer
-from pydantic import ValidationError
+from multi_doc_chat.prompts.prompt_library import CONTEXTUALIZE_PROMPT, CONTEXT_PROMPT
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
+MAX_CONTEXT_CHARS = 8000 # upper bound on retrieved context sent to the LLM
+ANSWER_CACHE_SIZE = 1024 # answers kept per ConversationalRAG instance
+MAX_ANSWER_CHARS = 4096 # keep in sync with ChatAnswer.answer max_length
+FAISS_CACHE_SIZE = 32 # loaded indexes kept in memory
+
+# (index_path, index_name) -> (mtime, vectorstore), in LRU order
+_faiss_cache: OrderedDict[Tuple[str, str], Tuple[float, FAISS]] = OrderedDict()
+_faiss_cache_lock = threading.Lock()
+
+def _index_mtime(index_path: str, index_name: str) -> float:
+    # latest write time of the index files, changes whenever the index is saved again
+    return max(
+        os.path.getmtime(os.path.join(index_path, f"{index_name}.faiss")),
+        os.path.getmtime(os.path.join(index_path, f"{index_name}.pkl")),
+    )
 
+def _load_faiss(index_path: str, index_name: str) -> FAISS:
+    """
+    Load a FAISS vectorstore from disk, reusing the loaded one while the files are unchanged.
+    A rewritten index (newer mtime) is loaded again and replaces the stale entry.
+    The returned vectorstore is shared by every session using this index.
+    """
+    from langchain_community.vectorstores import FAISS # heavy, imported on first load
+
+    key = (index_path, index_name)
+    mtime = _index_mtime(index_path, index_name)
+    with _faiss_cache_lock:
+        cached = _faiss_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            _faiss_cache.move_to_end(key)
+            return cached[1]
+
+    log.info(f"Loading FAISS index from disk, index_path={index_path}, index_name={index_name}")
+    vectorstore = FAISS.load_local(
+        index_path,
+        get_embeddings(),
+        index_name=index_name,
+        allow_dangerous_deserialization=True
+    )
+
+    with _faiss_cache_lock:
+        _faiss_cache[key] = (mtime, vectorstore) # replaces any older version of this index
+        _faiss_cache.move_to_end(key)
+        while len(_faiss_cache) > FAISS_CACHE_SIZE:
+            _faiss_cache.popitem(last=False) # evict least recently used
+    return vectorstore
 
 class ConversationalRAG:
 
@@ -24,16 +75,18 @@ class ConversationalRAG:
 
             # load llm and prompts
             self.llm = self._load_llm()
-            self.contextualize_prompt: ChatPromptTemplate = PREOMPT_REGISTRY[
-                PromptType.CONTEXTUALIZE_QUESTION.value
-            ]
-            self.question_prompt: ChatPromptTemplate = PREOMPT_REGISTRY[
-                PromptType.CONTEXT_QUESTION.value
-            ]
+            self.contextualize_prompt: ChatPromptTemplate = CONTEXTUALIZE_PROMPT
+            self.question_prompt: ChatPromptTemplate = CONTEXT_PROMPT
 
             # lazy pieces
             self.retriever = retriever
+            self.question_rewrite = None
             self.chain = None
+
+            # LRU cache of answers keyed by rewritten question
+            self._answer_cache: OrderedDict[str, str] = OrderedDict()
+            self._cache_hits = 0
+            self._cache_misses = 0
             if self.retriever is not None:
                 self._build_lcel_chain()
 
@@ -71,17 +124,13 @@ class ConversationalRAG:
             if not os.path.isdir(index_path):
                 raise FileNotFoundError(f"FAISS index directory not found: {index_path}")
             
-            embeddings = ModelLoader().load_embeddings()
-            vectorstore = FAISS.load_local(
-                index_path,
-                embeddings,
-                index_name=index_name,
-                allow_dangerous_deserialization=True
-            )
+            vectorstore = _load_faiss(os.path.abspath(index_path), index_name)
+
+            set_search_params(vectorstore, fetch_k if search_type == "mmr" else k)
 
             if search_kwargs is None:
                 search_kwargs = {"k": k}
-                if search_kwargs == "mmr":
+                if search_type == "mmr":
                     search_kwargs["fetch_k"] = fetch_k
                     search_kwargs["lambda_mult"] = lambda_mult
 
@@ -112,6 +161,8 @@ class ConversationalRAG:
     def invoke(self, user_input: str, chat_history: Optional[List[BaseMessage]] = None) -> str:
         """
         invoke the LCEL pipeline.
+        Answers are cached by the rewritten (standalone) question,
+        so repeated questions skip retrieval and the answer LLM call.
         """
         try:
             if self.chain is None:
@@ -120,42 +171,80 @@ class ConversationalRAG:
                 )
             chat_history = chat_history or []
             payload = {"input": user_input, "chat_history": chat_history}
-            answer = self.chain.invoke(payload)
+            question = self.question_rewrite.invoke(payload)
+
+            key = self._cache_key(question)
+            cached = self._answer_cache.get(key)
+            if cached is not None:
+                self._answer_cache.move_to_end(key)
+                self._cache_hits += 1
+                log.info(f"Answer cache hit, session_id={self.session_id}, hit_ratio={self._cache_hit_ratio():.2f}")
+                return cached
+            self._cache_misses += 1
+
+            answer = self.chain.invoke({"question": question})
             if not answer:
                 log.warning(f"No answer generated, user_input={user_input}, session_id={self.session_id}")
                 return "No answer generated."
         
-            try:
-                validated = ChatAnswer(answer=str(answer))
-                answer = validated.answer
-            except ValidationError as ve:
-                log.error(f"Invalid chat answer {str(ve)}")
-                raise ProjectException(ve, sys)
+            # same bounds as ChatAnswer, checked inline to skip building a pydantic model per turn
+            answer = str(answer)
+            n = len(answer)
+            if not (1 <= n <= MAX_ANSWER_CHARS):
+                log.error(f"Invalid chat answer, length {n} out of range [1, {MAX_ANSWER_CHARS}]")
+                raise ProjectException(f"answer length {n} out of range [1, {MAX_ANSWER_CHARS}]", sys)
+
+            self._answer_cache[key] = answer
+            if len(self._answer_cache) > ANSWER_CACHE_SIZE:
+                self._answer_cache.popitem(last=False) # evict least recently used
             log.info(
-                """Chain invoked successfully,
+                f"""Chain invoked successfully,
                 session_id={self.session_id},
                 user_input={user_input},
-                answer_preview={answer[:100]}""",
+                answer_preview={answer[:100]},
+                cache_hit_ratio={self._cache_hit_ratio():.2f}""",
             )
             return answer
         except Exception as e:
             log.error(f"Failed to invoke ConversationalRAG {e}")
             raise ProjectException("Invocation error in ConversationalRAG", sys)
 
+    def _cache_key(self, question: str) -> str:
+        # the session is part of the key, so answers never leak between sessions
+        raw = f"{self.session_id}\x00{question.strip()}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _cache_hit_ratio(self) -> float:
+        total = self._cache_hits + self._cache_misses
+        return self._cache_hits / total if total else 0.0
+
     def _load_llm(self):
         try:
-            llm = ModelLoader().load_llm()
+            llm = get_llm()
             if not llm:
                 raise ValueError("LLM could not be loaded")
-            log.info("LLM loaded successfully", session_id=self.session_id)
+            log.info(f"LLM loaded successfully, session_id={self.session_id}")
             return llm
         except Exception as e:
             log.error(f"Failed to load LLM {e}")
             raise ProjectException("LLM loading error in ConversationalRAG", sys)
 
     @staticmethod
-    def _format_docs(docs) -> str:
-        return "\n\n".join(getattr(d, "page_content", str(d)) for d in docs)
+    def _format_docs(docs, max_chars: int = MAX_CONTEXT_CHARS) -> str:
+        """
+        Join retrieved docs into the prompt context,
+        truncated to max_chars so oversized prompts are never sent to the LLM.
+        """
+        parts = [d.page_content if isinstance(d, Document) else str(d) for d in docs]
+        if sum(map(len, parts)) + 2 * max(len(parts) - 1, 0) > max_chars:
+            kept, budget = [], max_chars
+            for part in parts:
+                if budget <= 0:
+                    break
+                kept.append(part[:budget])
+                budget -= len(part) + 2 # account for the separator
+            parts = kept
+        return "\n\n".join(parts)
 
 
     def _build_lcel_chain(self):
@@ -164,27 +253,28 @@ class ConversationalRAG:
                 raise ProjectException("No retriever set before building chain", sys)
             
             # 1). rewrite the question with chat histroy context
-            question_rewrite = (
-                {"input": itemgetter("input"), "chat_histry": itemgetter("chat_history")}
+            self.question_rewrite = (
+                {"input": itemgetter("input"), "chat_history": itemgetter("chat_history")}
                 | self.contextualize_prompt
                 | self.llm
-                | StrOutputParser
+                | StrOutputParser()
             )
 
-            # 2). retrive docs for rewrite questio
-            retrieve_docs = question_rewrite | self.retriever | self._format_docs
+            # 2). retrive docs for the rewritten question
+            retrieve_docs = itemgetter("question") | self.retriever | self._format_docs
 
-            # 3). answer using retrieved context + original input + chat histroy
+            # 3). answer the standalone question from the retrieved context only,
+            # so the answer depends on nothing but the question it is cached under
             self.chain = (
                 {
                     "context": retrieve_docs,
-                    "input": itemgetter("input"),
-                    "chat_histroy": itemgetter("chat_history"),
+                    "input": itemgetter("question"),
                 }
                 | self.question_prompt
                 | self.llm
-                |StrOutputParser
+                | StrOutputParser()
             )
+            self._answer_cache.clear() # answers from a previous retriever are stale
             log.info(f"LCEL graph built successfully, session_id={self.session_id}")
         except Exception as e:
             log.error("Failed to build LCEL chain, error={e}, session_id={self.session_id}")
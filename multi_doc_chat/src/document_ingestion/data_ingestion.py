@@ -8,27 +8,41 @@ Returns a retriever object (used later for querying documents with an LLM).
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Iterable, List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Iterable, List, Optional, Dict, Any
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from multi_doc_chat.utils.model_loader import ModelLoader
+from multi_doc_chat.utils.model_loader import ModelLoader, get_model_loader, get_embeddings
 from multi_doc_chat.logger import logging as log
 from multi_doc_chat.exception import ProjectException
-import json
+import sqlite3
 import uuid
 from datetime import datetime
 from multi_doc_chat.utils.file_io import save_uploaded_files
 from multi_doc_chat.utils.document_ops import load_documents
-import hashlib
+from multi_doc_chat.utils.vector_index import build_index, set_search_params
+from multi_doc_chat.utils.embedding_cache import EmbeddingCache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import xxhash
 import sys
 
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+
 def generate_sesstion_id() -> str:
     # Create a unique folder name per user session.
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     unique_id = uuid.uuid4().hex[:8]
     return f"session_{timestamp}_{unique_id}" # session_20251026_103848_269900d5
 
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    # splitters are stateless, so one instance per (chunk_size, chunk_overlap) is reused across ingests
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
 class ChatIngestor:
     def __init__(
             self,
@@ -38,7 +52,7 @@ class ChatIngestor:
             session_id: Optional[str] = None
     ):
         try:
-            self.model_loader = ModelLoader() # create model loader
+            self.model_loader = get_model_loader() # shared model loader
             self.user_session = use_session_dirs 
             self.session_id = session_id or generate_sesstion_id() 
             self.temp_base = Path(temp_base); self.temp_base.mkdir(parents=True, exist_ok=True)
@@ -47,6 +61,12 @@ class ChatIngestor:
             self.temp_dir = self._resolve_dir(self.temp_base)
             self.faiss_dir = self._resolve_dir(self.fasiss_base)
 
+            # shared by all sessions, so re-uploaded text is never embedded twice
+            self.embedding_cache = EmbeddingCache(
+                self.fasiss_base / "embedding_cache.sqlite",
+                self.model_loader.config["embedding_model"]["model_name"]
+            )
+
             log.info("ChatIngestor initialized")
 
         except Exception as e:
@@ -66,10 +86,7 @@ class ChatIngestor:
         return base # fallback: "faiss_index/"
     
     def _split(self, docs: List[Document], chunk_size=1000, chunk_overlap=200) -> List[Document]:
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
+        splitter = _get_splitter(chunk_size, chunk_overlap)
         chunks = splitter.split_documents(docs)
         log.info(f"Documents split, chunks={len(chunks)}, chunk_size={chunk_size}, overlap={chunk_overlap}")
         return chunks
@@ -83,27 +100,31 @@ class ChatIngestor:
             k: int = 5,
             search_type: str = "mmr",
             fetch_k: int = 20,
-            lambda_mult: float = 0.5
+            lambda_mult: float = 0.5,
+            batch_size: int = 128,
+            max_workers: int = 8
         ):
         try:
             paths = save_uploaded_files(uploaded_file, self.temp_dir) # save uploaded files in disk
             docs = load_documents(paths) # read files
-            chunks = self._split(docs) # split docs to chunks
-
-            fm = FaissManager(self.faiss_dir, self.model_loader) # faiss mamager
-            texts = [c.page_content for c in chunks]
-            metas = [c.metadata for c in chunks]
+            chunks = self._split(docs, chunk_size=chunk_size, chunk_overlap=chunk_overlap) # split docs to chunks
 
-            try:
-                vs = fm.load_or_create(texts=texts, metadatas=metas) # vecterstore
-            except Exception:
-                vs = fm.load_or_create(texts=texts, metadatas=metas) # vecterstore
+            fm = FaissManager(self.faiss_dir, embedding_cache=self.embedding_cache) # faiss mamager, shared embeddings
+            new_chunks = fm.filter_new(chunks) # dedup before anything is embedded
 
-            added = fm.add_documents(chunks) # add new embeddings
-            log.info(f"FAISS index updated {str(self.faiss_dir)}")
+            if fm._exists():
+                vs = fm.load_or_create() # vecterstore
+                added = fm.add_documents(new_chunks, batch_size=batch_size, max_workers=max_workers) # add new embeddings
+            else:
+                texts = [c.page_content for c in new_chunks]
+                metas = [c.metadata for c in new_chunks]
+                vs = fm.load_or_create(texts=texts, metadatas=metas, batch_size=batch_size, max_workers=max_workers)
+                added = len(new_chunks)
+            log.info(f"FAISS index updated {str(self.faiss_dir)}, added={added}, skipped={len(chunks) - added}")
 
             # Configure search parameters based on search type
             search_kwargs = {"k": k}
+            set_search_params(vs, fetch_k if search_type == "mmr" else k, self.model_loader.config)
 
             if search_type == "mmr":
                 # MMR needs fetch_k (docs to fetch) and lambda_mult (diversity parameter)
@@ -112,33 +133,40 @@ class ChatIngestor:
                 # log.info("Using MMR search", k=k, fetch_k=fetch_k, lambda_mult=lambda_mult)
                 log.info("Using MMR search")
 
-            return vs._as_retriever(search_type=search_type, search_kwargs=search_kwargs)
+            return vs.as_retriever(search_type=search_type, search_kwargs=search_kwargs)
 
         except Exception as e:
             log.error(f"Faild to build retriver {e}")
             raise ProjectException(e, sys)
-_split
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 
 # FAISS Manager (load-or-create)
 class FaissManager:
     # Responsible for managing FAISS index creation, updating, and deduplication.
-    def __init__(self, index_dir: Path, model_loader: Optional[ModelLoader] = None):
+    def __init__(
+            self,
+            index_dir: Path,
+            model_loader: Optional[ModelLoader] = None,
+            embedding_cache: Optional[EmbeddingCache] = None
+    ):
         self.index_dir = Path(index_dir)
         self.index_dir.mkdir(parents=True, exist_ok=True)
 
-        self.meta_path = self.index_dir / "ingested_meta.json"
-        self._meta: Dict[str: Any] = {"rows": {}} # this is dict of rows
-
-        if self.meta_path.exists():
-            try:
-                self._meta = json.loads(self.meta_path.read_text(encoding="utf-8")) or {"rows": {}} # load it if alrady there
-            except Exception:
-                self._meta = {"rows": {}} # init the empty one if dones not exists
-
-        self.medel_loader = model_loader or ModelLoader()
-        self.emb = self.model_loader.load_embeddings()
+        # fingerprints of ingested chunks, one indexed row per chunk
+        self.meta_path = self.index_dir / "ingested_meta.sqlite"
+        self._conn = sqlite3.connect(str(self.meta_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS ingested (fp TEXT PRIMARY KEY)")
+
+        if model_loader is None: # shared loader and embeddings
+            self.model_loader = get_model_loader()
+            self.emb = get_embeddings()
+        else:
+            self.model_loader = model_loader
+            self.emb = model_loader.load_embeddings()
+        self.emb_cache = embedding_cache
         self.vs: Optional[FAISS] = None
 
 
@@ -149,45 +177,106 @@ class FaissManager:
     def _fingerprint(text: str, md: Dict[str, Any]) -> str:
         """
         Creates a unique identifier for each document chunk based on:
-            File path, orRow ID, orHash of the text content.
+            File path + Row ID (tabular sources), or Hash of the text content.
         Used to avoid re-adding duplicate chunks.
         """
         src = md.get("source") or md.get("file_path")
-        rid = md.get("raw_id")
-        if src is not None:
-            return f"{src}::{'' if rid is None else rid}"
-        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+        rid = md.get("row_id")
+        if src is not None and rid is not None:
+            return f"{src}::{rid}"
+        # chunks of the same file share a source, so they are told apart by content
+        return xxhash.xxh3_128_hexdigest(text.encode("utf-8", "ignore"))
 
-    def _save_meta(self):
-         self.meta_path.write_text(json.dumps(self._meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    def _embed(self, texts: List[str], batch_size: int = 128, max_workers: int = 8) -> List[List[float]]:
+        """
+        Embeds texts in batches of batch_size,
+        sending the batches to the embedding API concurrently.
+        Texts found in the embedding cache are not sent at all.
+        Output order matches the input order.
+        """
+        vecs = self.emb_cache.get_many(texts) if self.emb_cache else [None] * len(texts)
+        missing = [i for i, v in enumerate(vecs) if v is None]
+        if not missing:
+            return vecs
+
+        todo = [texts[i] for i in missing]
+        batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+        if len(batches) <= 1:
+            fresh = self.emb.embed_documents(todo)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+                fresh = [vec for batch in pool.map(self.emb.embed_documents, batches) for vec in batch]
+
+        if self.emb_cache:
+            self.emb_cache.put_many(todo, fresh)
+        for i, vec in zip(missing, fresh):
+            vecs[i] = vec
+        log.info(f"Embedded chunks, requested={len(todo)}, from_cache={len(texts) - len(todo)}")
+        return vecs
+
+    def filter_new(self, docs: List[Document]) -> List[Document]:
+        """
+        Returns the chunks that are not ingested yet
+        (first occurrence only), without embedding anything.
+        """
+        seen = set()
+        new_docs: List[Document] = []
+        for d in docs:
+            key = self._fingerprint(d.page_content, d.metadata or {})
+            if key in seen:
+                continue
+            seen.add(key)
+            if self._conn.execute("SELECT 1 FROM ingested WHERE fp = ?", (key,)).fetchone():
+                continue
+            new_docs.append(d)
+        return new_docs
 
-    def add_documents(self, docs: List[Document]):
+    def add_documents(self, docs: List[Document], batch_size: int = 128, max_workers: int = 8):
         """
         Adds only new chunks:
             Generates fingerprints.
             Skips duplicates.
-            Updates FAISS index and metadata JSON.
+            Embeds new chunks in concurrent batches.
+            Updates FAISS index and the fingerprint store.
         """
-        if self.vs in None:
+        if self.vs is None:
             raise RuntimeError("Call load_or_create() before add_documents_idempotent().")
 
-        new_docs = List[Document] = []
+        new_docs: List[Document] = []
 
+        cur = self._conn.cursor()
         for d in docs:
             key = self._fingerprint(d.page_content, d.metadata or {})
-            if key in self._meta["raws"]:
+            cur.execute("INSERT OR IGNORE INTO ingested VALUES(?)", (key,))
+            if cur.rowcount == 0: # already ingested
                 continue
-            self._meta["raws"][key] = True
             new_docs.append(d)
 
-        if new_docs:
-            self.vs.add_documents(new_docs)
-            self.vs.save_local(str(self.index_dir))
-            self._save_meta()
+        try:
+            if new_docs:
+                texts = [d.page_content for d in new_docs]
+                metas = [d.metadata for d in new_docs]
+                vecs = self._embed(texts, batch_size=batch_size, max_workers=max_workers)
+                self.vs.add_embeddings(list(zip(texts, vecs)), metadatas=metas)
+                self.vs.save_local(str(self.index_dir)) # persist once, after all batches
+        except Exception:
+            self._conn.rollback() # keep fingerprints in sync with the index
+            raise
+        self._conn.commit()
         return len(new_docs)
 
 
-    def load_or_create(self,texts:Optional[List[str]]=None, metadatas: Optional[List[dict]] = None):
+    def load_or_create(
+            self,
+            texts: Optional[List[str]] = None,
+            metadatas: Optional[List[dict]] = None,
+            batch_size: int = 128,
+            max_workers: int = 8
+    ):
+        # imported on first use, the FAISS extension is heavy to load
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+
         if self._exists():
             self.vs = FAISS.load_local(
                 str(self.index_dir),
@@ -198,8 +287,24 @@ class FaissManager:
         
         if not texts:
             raise ProjectException("No existing FAISS index and no data to create one", sys)
-        self.vs = FAISS.from_texts(texts=texts, embedding=self.emb, metadatas=metadatas or [])
+        metadatas = metadatas or [{} for _ in texts]
+        vecs = self._embed(texts, batch_size=batch_size, max_workers=max_workers)
+        index = build_index(vecs, self.model_loader.config)
+        self.vs = FAISS(
+            embedding_function=self.emb,
+            index=index,
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
+        )
+        self.vs.add_embeddings(list(zip(texts, vecs)), metadatas=metadatas)
         self.vs.save_local(str(self.index_dir))
+
+        # record what the new index holds, so add_documents() will not add it again
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO ingested VALUES(?)",
+            ((self._fingerprint(t, md or {}),) for t, md in zip(texts, metadatas))
+        )
+        self._conn.commit()
         return self.vs
 
 
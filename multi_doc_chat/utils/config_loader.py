@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 import os
 import yaml
@@ -6,6 +7,7 @@ def _project_root() -> Path:
     # .../utils/config_loader.py -> parents[1] == project root
     return Path(__file__).resolve().parents[1] # __file__ - stores the path of the current file
 
+@lru_cache(maxsize=1)
 def load_config(config_path: str | None = None)  -> dict:
     env_path = os.getenv("CONFIG_PATH")
     if config_path is None:
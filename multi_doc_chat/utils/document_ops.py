@@ -1,36 +1,127 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Iterable, List, Optional
 from langchain_core.documents import Document
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, TextLoader
 from multi_doc_chat.logger import logging as log
 from multi_doc_chat.exception import ProjectException
-from fastapi import UploadFile
+import multiprocessing
+import os
 import sys
+import threading
+
+if TYPE_CHECKING:
+    from fastapi import UploadFile
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+CPU_BOUND_EXTENSIONS = {".pdf", ".docx"} # parsed in worker processes
+MAX_PARSER_WORKERS = 4 # each worker is a full interpreter kept alive for the process lifetime
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+def _init_worker() -> None:
+    # workers log to stderr only, the rotating log file must have a single writer
+    root = log.getLogger()
+    for h in list(root.handlers):
+        if isinstance(h, log.FileHandler):
+            root.removeHandler(h)
+            h.close()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Return the process-wide parser pool, created on first use.
+    Workers are spawned, not forked: forking a multithreaded server
+    can deadlock on locks held by other threads (e.g. logging).
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, MAX_PARSER_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return _process_pool
+
+def _reset_process_pool() -> None:
+    # drop a broken pool (e.g. a worker was killed), the next call creates a new one
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+@lru_cache(maxsize=None)
+def _loader_cls(ext: str):
+    """
+    Import the loader class for an extension on first use,
+    so parser dependencies (pypdf, docx2txt) are only loaded when needed.
+    """
+    if ext == ".pdf":
+        from langchain_community.document_loaders import PyPDFLoader
+        return PyPDFLoader
+    if ext == ".docx":
+        from langchain_community.document_loaders import Docx2txtLoader
+        return Docx2txtLoader
+    if ext == ".txt":
+        from langchain_community.document_loaders import TextLoader
+        return TextLoader
+    return None
+
+def _load_one(p: Path) -> List[Document]:
+    """
+    Load a single file using the loader matching its extension.
+    Top-level so it can be sent to worker processes.
+    """
+    try:
+        ext = p.suffix.lower()
+        loader_cls = _loader_cls(ext)
+        if loader_cls is None:
+            log.warning(f"Unsupported extension skipped {p}")
+            return []
+        if ext == ".txt":
+            loader = loader_cls(str(p), encoding="utf-8")
+        else:
+            loader = loader_cls(str(p))
+        return loader.load()
+    except Exception as e:
+        log.error(f"Failed loading document {p} {e}")
+        return []
 
 def load_documents(paths: Iterable[Path]) -> List[Document]:
     """
     Load docs using appropriate loader based on extension.
+    PDF/DOCX files are parsed in a process pool, TXT files in a thread pool.
     """
 
-    docs: list[Document] = []
-
     try:
-        for p in paths:
-            ext = p.suffix.lower()
-            if ext == ".pdf":
-                loader = PyPDFLoader(str(p))
-            elif ext == ".docx":
-                loader = Docx2txtLoader(str(p))
-            elif ext == ".txt":
-                loader = TextLoader(str(p), encoding="utf-8")
-            else:
-                log.warning(f"Unsupported extension skipped {p}")
-                continue
-            docs.extend(loader.load())
+        paths = [Path(p) for p in paths]
+        heavy = [p for p in paths if p.suffix.lower() in CPU_BOUND_EXTENSIONS]
+        light = [p for p in paths if p.suffix.lower() not in CPU_BOUND_EXTENSIONS]
+
+        results = {}
+        if len(heavy) > 1:
+            try:
+                results.update(zip(heavy, _get_process_pool().map(_load_one, heavy)))
+            except BrokenProcessPool as e:
+                log.warning(f"Parser process pool broken, loading in process {e}")
+                _reset_process_pool()
+                results.update((p, _load_one(p)) for p in heavy)
+        else:
+            results.update((p, _load_one(p)) for p in heavy)
+
+        if light:
+            with ThreadPoolExecutor(max_workers=min(len(light), 8)) as pool:
+                results.update(zip(light, pool.map(_load_one, light)))
+
+        # keep the input order of the files
+        docs: list[Document] = list(chain.from_iterable(results[p] for p in paths))
         log.info(f"{len(docs)} Documents loaded")
+        return docs
 
     except Exception as e:
         log.error(f"Failed loading documents {e}")
@@ -39,13 +130,18 @@ def load_documents(paths: Iterable[Path]) -> List[Document]:
 
 class FastAPIFileAdapter:
     """
-    Adapt FastAPI UploadFile to a simple object with .name and .getbuffer().
+    Adapt FastAPI UploadFile to a simple object with .name, .file and .getbuffer().
     """
 
     def __init__(self, uf: UploadFile):
         self._uf = uf
         self.name = uf.filename or "file"
 
+    @property
+    def file(self):
+        # underlying file object, lets save_uploaded_files stream it to disk
+        return self._uf.file
+
     def getbuffer(self) -> bytes:
         self._uf.file.seek(0)
         return self._uf.file.read()
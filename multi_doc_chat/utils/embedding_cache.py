@@ -0,0 +1,57 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import List, Optional, Sequence
+import sqlite3
+import xxhash
+
+# numpy is imported inside the methods, so importing this module stays cheap
+
+class EmbeddingCache:
+    """
+    Persistent cache of embedding vectors keyed by (model name, text hash).
+    Lets re-ingested text skip the embedding API, even after an index is deleted.
+    """
+
+    _QUERY_BATCH = 500 # stay below sqlite's bound-parameter limit
+
+    def __init__(self, path: Path, model_name: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (model TEXT, key TEXT, vec BLOB, PRIMARY KEY (model, key))"
+        )
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return xxhash.xxh3_128_hexdigest(text.encode("utf-8", "ignore"))
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        # cached vector for each text, None where it has not been embedded yet
+        import numpy as np
+
+        keys = [self._key(t) for t in texts]
+        found = {}
+        for i in range(0, len(keys), self._QUERY_BATCH):
+            batch = keys[i:i + self._QUERY_BATCH]
+            rows = self._conn.execute(
+                f"SELECT key, vec FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(batch))})",
+                (self.model_name, *batch),
+            )
+            found.update(rows)
+        return [np.frombuffer(found[k], dtype="float32").tolist() if k in found else None for k in keys]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        import numpy as np
+
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings VALUES(?, ?, ?)",
+            (
+                (self.model_name, self._key(t), np.asarray(v, dtype="float32").tobytes())
+                for t, v in zip(texts, vectors)
+            ),
+        )
+        self._conn.commit()
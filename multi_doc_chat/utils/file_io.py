@@ -1,6 +1,7 @@
 
 from __future__ import annotations
-import re
+import shutil
+import string
 import sys
 import uuid
 from pathlib import Path
@@ -9,6 +10,18 @@ from multi_doc_chat.exception import ProjectException
 from multi_doc_chat.logger import logging as log
 
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt", ".pptx", ".md", ".csv", ".xlsx", ".xls", ".db", ".sqlite", ".sqlite3"}
+COPY_BUFFER_SIZE = 1024 * 1024  # 1 MB
+_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+class _SafeNameTable(dict):
+    # str.translate table mapping every char outside [a-zA-Z0-9_-] to "_", filled lazily
+    def __missing__(self, code: int) -> int:
+        if code >= 128:
+            return ord("_") # never safe; not stored, so untrusted names cannot grow the table
+        self[code] = code if chr(code) in _SAFE_CHARS else ord("_")
+        return self[code]
+
+_SAFE_NAME_TABLE = _SafeNameTable()
 
 def save_uploaded_files(uploaded_files: Iterable, target_dir: Path) -> List[Path]:
     """
@@ -23,39 +36,36 @@ def save_uploaded_files(uploaded_files: Iterable, target_dir: Path) -> List[Path
 
             # manage unsupported files
             if ext not in SUPPORTED_EXTENSIONS:
-                log.warrning(f"Unsupported file skipped {name}")
+                log.warning(f"Unsupported file skipped {name}")
                 continue
 
             # clean file name
-            safe_name = re.sub(r'[^a-zA-Z0-9_\-]', '_', Path(name).stem).lower()
+            safe_name = Path(name).stem.translate(_SAFE_NAME_TABLE).lower()
             fname = f"{safe_name}_{uuid.uuid4().hex[:6]}{ext}"
             out = target_dir / fname
 
             with open(out, "wb") as f:
                 # Prefer underlying file buffer when available (e.g., Starlette UploadFile.file)
                 if hasattr(uf, "file") and hasattr(uf.file, "read"):
-                    f.write(uf.file.read())
+                    if hasattr(uf.file, "seek"):
+                        uf.file.seek(0)
+                    shutil.copyfileobj(uf.file, f, COPY_BUFFER_SIZE)
                 elif hasattr(uf, "read"):
-                    data = uf.read()
-                    # If a memoryview is returned, convert to bytes; otherwise assume bytes
-                    if isinstance(data, memoryview):
-                        data = data.tobytes()
-                    f.write(data)
+                    # stream in chunks so memory stays bounded by the buffer size
+                    shutil.copyfileobj(uf, f, COPY_BUFFER_SIZE)
                 else:
                     # Fallback for objects exposing a getbuffer()
                     buf = getattr(uf, "getbuffer", None)
                     if callable(buf):
-                        data = buf()
-                        if isinstance(data, memoryview):
-                            data = data.tobytes()
-                        f.write(data)
+                        f.write(buf()) # bytes or memoryview, written as returned
                     else:
                         raise ValueError("Unsupported uploaded file object; no readable interface")
             saved.append(out)
             log.info(f"File saved for ingestion, uploaded={name}, saved_as={str(out)}")
+        return saved
 
     except Exception as e:
-        log.error("")
+        log.error(f"Failed to save uploaded files {e}")
         raise ProjectException(e, sys)
 
 
@@ -2,12 +2,17 @@
 import os
 import sys
 import json
+from functools import lru_cache
+import httpx
 from dotenv import load_dotenv
 from multi_doc_chat.utils.config_loader import load_config
-from langchain_mistralai import MistralAIEmbeddings, ChatMistralAI
 from multi_doc_chat.logger import logging as log
 from multi_doc_chat.exception import ProjectException
 
+MISTRAL_BASE_URL = "https://api.mistral.ai/v1"
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0 # same as the langchain-mistralai default, full completions can be slow
+
 class ApiKeyManage:
     # Handles loading and validation of all required API keys
     REQUIRED_KEYS = ["MISTRAL_API_KEY"]
@@ -65,6 +70,27 @@ class ModelLoader():
         self.config = load_config()
         # log.info("YAML config loaded", config_keys=list(self.config.keys()))
         log.info("YAML config loaded")
+        self._client: httpx.Client | None = None
+
+    def _http_client(self) -> httpx.Client:
+        # one pooled HTTP/2 client shared by the embedding model and the LLM (sync calls only)
+        if self._client is None:
+            http_cfg = self.config.get("http") or {}
+            self._client = httpx.Client(
+                base_url=os.getenv("MISTRAL_BASE_URL", MISTRAL_BASE_URL),
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "application/json",
+                    "Authorization": f"Bearer {self.api_key_mgt.get('MISTRAL_API_KEY')}",
+                },
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=httpx.Timeout(
+                    http_cfg.get("read_timeout", DEFAULT_READ_TIMEOUT),
+                    connect=http_cfg.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+                ),
+            )
+        return self._client
 
 
     def load_llm(self):
@@ -88,11 +114,13 @@ class ModelLoader():
         log.info("Loading LLM")
 
         if provider == "mistral":
+            from langchain_mistralai import ChatMistralAI
             return ChatMistralAI(
                 model=model_name,
                 mistral_api_key=self.api_key_mgt.get("MISTRAL_API_KEY"),
                 temperature=temperature,
-                model_kwargs={"max_output_tokens": max_tokens}
+                model_kwargs={"max_output_tokens": max_tokens},
+                client=self._http_client()
             )
         else:
             # log.error("Unsupported LLM provider", provider=provider)
@@ -103,18 +131,31 @@ class ModelLoader():
         try:
             model_name = self.config["embedding_model"]["model_name"]
             log.info("Loading embedding model")
-            
+
+            from langchain_mistralai import MistralAIEmbeddings
             return MistralAIEmbeddings(model=model_name,
-                                       mistral_api_key=self.api_key_mgt.get("MISTRAL_API_KEY"))
+                                       mistral_api_key=self.api_key_mgt.get("MISTRAL_API_KEY"),
+                                       client=self._http_client())
         except Exception as e:
-            # todo: change this
-            # log.error("Error loading embedding model", error=str(e))
-            # raise DocumentPortalException("Failed to load embedding model", sys)
-            log.error("Error loading embedding model")
-            ProjectException(e, sys)
+            log.error(f"Error loading embedding model {e}")
+            raise ProjectException(e, sys)
+
+# process-wide singletons, so clients (and their HTTP connections) are reused across requests
+# (the loaders raise on failure, so a failed load is never cached and is retried on the next call)
+@lru_cache(maxsize=1)
+def get_model_loader() -> ModelLoader:
+    return ModelLoader()
+
+@lru_cache(maxsize=1)
+def get_embeddings():
+    return get_model_loader().load_embeddings()
+
+@lru_cache(maxsize=1)
+def get_llm():
+    return get_model_loader().load_llm()
 
 def test():
-    loader = ModelLoader()
+    loader = get_model_loader()
     loader.load_embeddings()
     loader.load_llm()
 
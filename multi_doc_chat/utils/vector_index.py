@@ -0,0 +1,76 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+from multi_doc_chat.utils.config_loader import load_config
+from multi_doc_chat.logger import logging as log
+
+# faiss is imported inside the functions below, so importing this module stays cheap
+if TYPE_CHECKING:
+    import faiss
+
+# scalar quantizer applied to stored vectors (None keeps full float32 vectors)
+QUANTIZERS = {
+    "none": None,
+    "fp16": "QT_fp16",
+    "int8": "QT_8bit",
+}
+MIN_INT8_TRAINING_VECTORS = 1000 # int8 needs a representative sample to learn value ranges
+
+def _index_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return (config or load_config()).get("vector_store") or {}
+
+def build_index(vectors: Sequence[Sequence[float]], config: Optional[Dict[str, Any]] = None) -> faiss.Index:
+    """
+    Create an empty FAISS index for vectors like the given ones,
+    based on the vector_store block of the config.
+    Quantized indexes that need training are trained on the given vectors.
+    """
+    import faiss
+    import numpy as np
+
+    cfg = _index_config(config)
+    index_type = cfg.get("index_type", "hnsw")
+    quantizer = cfg.get("quantizer", "none")
+    dim = len(vectors[0])
+
+    if quantizer not in QUANTIZERS:
+        raise ValueError(f"Unsupported vector_store quantizer: {quantizer}")
+    if quantizer == "int8" and len(vectors) < MIN_INT8_TRAINING_VECTORS:
+        # int8 learns per-dimension min/max from these vectors, a handful gives degenerate (min == max) ranges
+        log.warning(
+            f"Too few vectors to train int8 quantizer ({len(vectors)} < {MIN_INT8_TRAINING_VECTORS}), using fp16"
+        )
+        quantizer = "fp16"
+    qname = QUANTIZERS[quantizer]
+    qtype = None if qname is None else getattr(faiss.ScalarQuantizer, qname)
+
+    if index_type == "flat":
+        if qtype is None:
+            index = faiss.IndexFlatL2(dim)
+        else:
+            index = faiss.IndexScalarQuantizer(dim, qtype, faiss.METRIC_L2)
+    elif index_type == "hnsw":
+        if qtype is None:
+            index = faiss.IndexHNSWFlat(dim, cfg.get("hnsw_m", 32))
+        else:
+            index = faiss.IndexHNSWSQ(dim, qtype, cfg.get("hnsw_m", 32))
+        index.hnsw.efConstruction = cfg.get("ef_construction", 200)
+    else:
+        raise ValueError(f"Unsupported vector_store index_type: {index_type}")
+
+    if not index.is_trained:
+        index.train(np.asarray(vectors, dtype="float32"))
+    return index
+
+def set_search_params(vectorstore, k: int, config: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Tune query time parameters of the loaded index for returning k results.
+    (efSearch for HNSW, no-op for flat indexes)
+    The index may be shared between sessions, so efSearch is only ever raised:
+    each caller gets at least the value it needs.
+    """
+    import faiss
+
+    index = getattr(vectorstore, "index", None)
+    if isinstance(index, faiss.IndexHNSW):
+        needed = max(k * 4, _index_config(config).get("ef_search", 64))
+        index.hnsw.efSearch = max(index.hnsw.efSearch, needed)
@@ -0,0 +1,52 @@
+# test_conversational_rag.py
+from unittest.mock import patch, MagicMock
+from langchain_core.documents import Document
+from multi_doc_chat.src.document_chat.retrieval import ConversationalRAG
+
+# ---- Test 1: context formatting ----
+def test_format_docs_joins_docs():
+    docs = [Document(page_content="alpha"), Document(page_content="beta")]
+    assert ConversationalRAG._format_docs(docs) == "alpha\n\nbeta"
+
+# ---- Test 2: context is capped at max_chars ----
+def test_format_docs_truncates():
+    docs = [Document(page_content="a" * 60), Document(page_content="b" * 60)]
+    context = ConversationalRAG._format_docs(docs, max_chars=100)
+    assert len(context) == 100
+    assert context.startswith("a" * 60 + "\n\n")
+
+# ---- Test 3: repeated questions are answered from the cache ----
+@patch("multi_doc_chat.src.document_chat.retrieval.get_llm")
+def test_invoke_caches_answers(mock_get_llm):
+    mock_get_llm.return_value = MagicMock()
+    rag = ConversationalRAG(session_id="session_test")
+    rag.question_rewrite = MagicMock()
+    rag.question_rewrite.invoke.return_value = "What is agentic AI?"
+    rag.chain = MagicMock()
+    rag.chain.invoke.return_value = "An answer."
+
+    assert rag.invoke("what is it?") == "An answer."
+    assert rag.invoke("and what is it again?") == "An answer."
+    # the answer chain only sees the cache key's question, never the raw input or history
+    rag.chain.invoke.assert_called_once_with({"question": "What is agentic AI?"})
+
+# ---- Test 4: loaded indexes are reused until rewritten, then replaced ----
+@patch("multi_doc_chat.src.document_chat.retrieval.get_embeddings")
+@patch("langchain_community.vectorstores.FAISS.load_local")
+def test_load_faiss_cache_replaces_stale_entry(mock_load_local, mock_get_embeddings, tmp_path):
+    import os
+    from multi_doc_chat.src.document_chat import retrieval
+
+    (tmp_path / "index.faiss").write_bytes(b"")
+    (tmp_path / "index.pkl").write_bytes(b"")
+    mock_load_local.side_effect = ["v1", "v2"]
+    retrieval._faiss_cache.clear()
+
+    assert retrieval._load_faiss(str(tmp_path), "index") == "v1"
+    assert retrieval._load_faiss(str(tmp_path), "index") == "v1"
+
+    os.utime(tmp_path / "index.faiss", (0, os.path.getmtime(tmp_path / "index.faiss") + 10))
+    assert retrieval._load_faiss(str(tmp_path), "index") == "v2"
+    assert len(retrieval._faiss_cache) == 1
+    assert mock_load_local.call_count == 2
+    retrieval._faiss_cache.clear()
@@ -30,6 +30,12 @@ def test_split_documents(fake_doc):
     assert len(chunks) >= 1
     assert all(hasattr(c, "page_content") for c in chunks)
 
+# ---- Test 2b: splitters are reused per (chunk_size, chunk_overlap) ----
+def test_splitter_is_reused():
+    from multi_doc_chat.src.document_ingestion.data_ingestion import _get_splitter
+    assert _get_splitter(500, 50) is _get_splitter(500, 50)
+    assert _get_splitter(500, 50) is not _get_splitter(500, 0)
+
 # ---- Test 3: FAISS manager fingerprinting ----
 def test_fingerprint_stable(fake_doc):
     fp1 = FaissManager._fingerprint(fake_doc.page_content, fake_doc.metadata)
@@ -37,6 +43,12 @@ def test_fingerprint_stable(fake_doc):
     assert fp1 == fp2  # deterministic
     assert isinstance(fp1, str)
 
+# ---- Test 3b: chunks of the same file get distinct fingerprints ----
+def test_fingerprint_distinguishes_chunks_of_same_source():
+    md = {"source": "fake.txt"}
+    assert FaissManager._fingerprint("chunk one", md) != FaissManager._fingerprint("chunk two", md)
+    assert FaissManager._fingerprint("a", {"source": "t.csv", "row_id": 1}) == "t.csv::1"
+
 # ---- Test 4: build_retriever pipeline (mocked) ----
 @patch("multi_doc_chat.src.document_ingestion.data_ingestion.save_uploaded_files")
 @patch("multi_doc_chat.src.document_ingestion.data_ingestion.load_documents")
@@ -51,9 +63,11 @@ def test_build_retriever(mock_faiss_manager, mock_load_docs, mock_save_files, fa
     mock_load_docs.return_value = [fake_doc]
 
     mock_vs = MagicMock()
-    mock_vs._as_retriever.return_value = "mock_retriever"
+    mock_vs.as_retriever.return_value = "mock_retriever"
 
     mock_faiss_instance = MagicMock()
+    mock_faiss_instance._exists.return_value = True
+    mock_faiss_instance.filter_new.return_value = [fake_doc]
     mock_faiss_instance.load_or_create.return_value = mock_vs
     mock_faiss_instance.add_documents.return_value = 1
     mock_faiss_manager.return_value = mock_faiss_instance
@@ -67,5 +81,33 @@ def test_build_retriever(mock_faiss_manager, mock_load_docs, mock_save_files, fa
     mock_faiss_instance.add_documents.assert_called_once()
     assert retriever == "mock_retriever"
 
+# ---- Test 5: a new index is built from the deduped chunks only ----
+@patch("multi_doc_chat.src.document_ingestion.data_ingestion.save_uploaded_files")
+@patch("multi_doc_chat.src.document_ingestion.data_ingestion.load_documents")
+@patch("multi_doc_chat.src.document_ingestion.data_ingestion.FaissManager")
+def test_build_retriever_new_index(mock_faiss_manager, mock_load_docs, mock_save_files, fake_doc, fake_files):
+    ingestor = ChatIngestor()
+    mock_save_files.return_value = fake_files
+    mock_load_docs.return_value = [fake_doc, fake_doc]
 
+    mock_faiss_instance = MagicMock()
+    mock_faiss_instance._exists.return_value = False
+    mock_faiss_instance.filter_new.return_value = [fake_doc]
+    mock_faiss_manager.return_value = mock_faiss_instance
 
+    ingestor.build_retriver(uploaded_file=fake_files)
+
+    _, kwargs = mock_faiss_instance.load_or_create.call_args
+    assert kwargs["texts"] == [fake_doc.page_content]
+    mock_faiss_instance.add_documents.assert_not_called()
+
+# ---- Test 6: a caller's own loader never builds the shared one ----
+@patch("multi_doc_chat.src.document_ingestion.data_ingestion.get_embeddings")
+@patch("multi_doc_chat.src.document_ingestion.data_ingestion.get_model_loader")
+def test_faiss_manager_uses_given_loader(mock_get_loader, mock_get_embeddings, tmp_path):
+    loader = MagicMock()
+    fm = FaissManager(tmp_path, loader)
+    assert fm.model_loader is loader
+    assert fm.emb is loader.load_embeddings.return_value
+    mock_get_loader.assert_not_called()
+    mock_get_embeddings.assert_not_called()
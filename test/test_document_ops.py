@@ -0,0 +1,26 @@
+# test_document_ops.py
+from multi_doc_chat.utils.document_ops import load_documents
+
+# ---- Test 1: documents keep file order and bad files are skipped ----
+def test_load_documents_order_and_skip(tmp_path):
+    a = tmp_path / "a.txt"; a.write_text("first file", encoding="utf-8")
+    b = tmp_path / "b.txt"; b.write_text("second file", encoding="utf-8")
+    bad = tmp_path / "notes.xyz"; bad.write_text("ignored", encoding="utf-8")
+    missing = tmp_path / "missing.txt"
+
+    docs = load_documents([a, bad, missing, b])
+
+    assert [d.page_content for d in docs] == ["first file", "second file"]
+
+# ---- Test 2: parser workers drop the rotating file handler ----
+def test_init_worker_removes_file_handlers():
+    import logging
+    from multi_doc_chat.utils.document_ops import _init_worker
+    root = logging.getLogger()
+    saved = list(root.handlers)
+    try:
+        _init_worker()
+        assert root.handlers
+        assert not any(isinstance(h, logging.FileHandler) for h in root.handlers)
+    finally:
+        root.handlers[:] = saved
@@ -0,0 +1,12 @@
+# test_embedding_cache.py
+from multi_doc_chat.utils.embedding_cache import EmbeddingCache
+
+# ---- Test 1: vectors round-trip and are scoped by model name ----
+def test_embedding_cache_round_trip(tmp_path):
+    path = tmp_path / "embedding_cache.sqlite"
+    cache = EmbeddingCache(path, "mistral-embed")
+    cache.put_many(["hello"], [[0.5, 0.25, -1.0]])
+
+    assert cache.get_many(["hello", "unseen"]) == [[0.5, 0.25, -1.0], None]
+    assert EmbeddingCache(path, "mistral-embed").get_many(["hello"]) == [[0.5, 0.25, -1.0]]
+    assert EmbeddingCache(path, "other-model").get_many(["hello"]) == [None]
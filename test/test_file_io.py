@@ -0,0 +1,48 @@
+# test_file_io.py
+import io
+from multi_doc_chat.utils.file_io import save_uploaded_files
+
+class _FakeUpload:
+    # mimics Starlette UploadFile: a filename plus an underlying .file
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.file = io.BytesIO(data)
+
+# ---- Test 1: uploads are streamed to disk and unsupported files skipped ----
+def test_save_uploaded_files(tmp_path):
+    payload = b"x" * (3 * 1024 * 1024 + 7)  # larger than one copy buffer
+    stream = io.BytesIO(b"plain text")
+    stream.name = "notes.txt"
+
+    saved = save_uploaded_files(
+        [_FakeUpload("Report.pdf", payload), stream, _FakeUpload("image.png", b"skip")],
+        tmp_path,
+    )
+
+    assert len(saved) == 2
+    assert saved[0].read_bytes() == payload
+    assert saved[1].read_bytes() == b"plain text"
+
+# ---- Test 2: file names are sanitized to [a-z0-9_-] ----
+def test_save_uploaded_files_sanitizes_names(tmp_path):
+    saved = save_uploaded_files([_FakeUpload("My Report (v2)_中文.txt", b"data")], tmp_path)
+    assert saved[0].name.startswith("my_report__v2___")
+    assert saved[0].suffix == ".txt"
+
+# ---- Test 3: the FastAPI adapter is streamed through its underlying file ----
+def test_save_uploaded_files_fastapi_adapter(tmp_path):
+    from unittest.mock import MagicMock
+    from multi_doc_chat.utils.document_ops import FastAPIFileAdapter
+
+    upload = _FakeUpload("notes.txt", b"streamed")
+    adapter = FastAPIFileAdapter(upload)
+    adapter.getbuffer = MagicMock(side_effect=AssertionError("getbuffer() reads the whole file"))
+
+    saved = save_uploaded_files([adapter], tmp_path)
+    assert saved[0].read_bytes() == b"streamed"
+
+# ---- Test 4: non-ASCII names do not grow the shared translate table ----
+def test_safe_name_table_stays_ascii():
+    from multi_doc_chat.utils.file_io import _SAFE_NAME_TABLE
+    assert "Ünïcødé_中文-1".translate(_SAFE_NAME_TABLE) == "_n_c_d____-1"
+    assert all(code < 128 for code in _SAFE_NAME_TABLE)
@@ -0,0 +1,14 @@
+# test_model_loader.py
+import pytest
+from unittest.mock import patch
+from multi_doc_chat.utils import model_loader
+
+# ---- Test 1: a failed embedding load is not cached ----
+def test_get_embeddings_does_not_cache_failures():
+    model_loader.get_embeddings.cache_clear()
+    with patch.object(model_loader, "get_model_loader") as mock_get_loader:
+        mock_get_loader.return_value.load_embeddings.side_effect = [RuntimeError("boom"), "embeddings"]
+        with pytest.raises(RuntimeError):
+            model_loader.get_embeddings()
+        assert model_loader.get_embeddings() == "embeddings"
+    model_loader.get_embeddings.cache_clear()
@@ -0,0 +1,16 @@
+# test_prompt_library.py
+import pytest
+from multi_doc_chat.prompts.prompt_library import PROMPT_REGISTRY
+from multi_doc_chat.model.models import PromptType
+
+# ---- Test 1: registered prompts render ----
+def test_contextualize_prompt_renders():
+    prompt = PROMPT_REGISTRY[PromptType.CONTEXTUALIZE_QUESTION.value]
+    messages = prompt.format_messages(input="and its price?", chat_history=[])
+    assert messages[0].type == "system"
+    assert messages[-1].content == "and its price?"
+
+# ---- Test 2: registry is read-only ----
+def test_registry_is_read_only():
+    with pytest.raises(TypeError):
+        PROMPT_REGISTRY["new_prompt"] = None
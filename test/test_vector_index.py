@@ -0,0 +1,27 @@
+# test_vector_index.py
+import numpy as np
+import pytest
+from multi_doc_chat.utils.vector_index import build_index, MIN_INT8_TRAINING_VECTORS
+
+VECTORS = np.random.default_rng(0).random((MIN_INT8_TRAINING_VECTORS, 16), dtype="float32")
+
+# ---- Test 1: every configured index type can be built, trained and searched ----
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+@pytest.mark.parametrize("quantizer", ["none", "fp16", "int8"])
+def test_build_index(index_type, quantizer):
+    index = build_index(VECTORS, {"vector_store": {"index_type": index_type, "quantizer": quantizer}})
+    assert index.is_trained
+    index.add(VECTORS)
+    _, ids = index.search(VECTORS[:1], 1)
+    assert ids[0][0] == 0
+
+# ---- Test 2: int8 falls back to fp16 when there is too little training data ----
+def test_build_index_int8_needs_enough_vectors():
+    config = {"vector_store": {"index_type": "flat", "quantizer": "int8"}}
+    assert build_index(VECTORS, config).code_size == 16  # 1 byte per dimension
+    assert build_index(VECTORS[:3], config).code_size == 32  # fp16, 2 bytes per dimension
+
+# ---- Test 3: unknown options are rejected ----
+def test_build_index_rejects_unknown_quantizer():
+    with pytest.raises(ValueError):
+        build_index(VECTORS, {"vector_store": {"quantizer": "int4"}})